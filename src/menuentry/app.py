@@ -1,5 +1,6 @@
 """TUI application for managing desktop entries."""
 
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical, VerticalScroll
 from textual.widgets import (
@@ -15,12 +16,17 @@ from textual.widgets import (
 )
 from textual.binding import Binding
 from textual.message import Message
+from textual.timer import Timer
+from textual.worker import Worker, get_current_worker
 from pathlib import Path
+import bisect
 
 from .desktop_file import (
     DesktopEntry,
-    load_all_entries,
+    iter_all_entries,
+    load_entry,
     get_user_applications_dir,
+    invalidate_cached_entry,
 )
 
 
@@ -32,6 +38,27 @@ class EntryList(ListView):
         Binding("k", "cursor_up", "Up", show=False),
     ]
 
+    def action_cursor_down(self) -> None:
+        """Highlight the next visible item in the list."""
+        self._move_cursor(1)
+
+    def action_cursor_up(self) -> None:
+        """Highlight the previous visible item in the list."""
+        self._move_cursor(-1)
+
+    def _move_cursor(self, step: int) -> None:
+        """Move the highlight by one, skipping items hidden by the filter."""
+        items = self.children
+        if self.index is None:
+            start = -1 if step > 0 else len(items)
+        else:
+            start = self.index
+        stop = len(items) if step > 0 else -1
+        for index in range(start + step, stop, step):
+            if items[index].display and not items[index].disabled:
+                self.index = index
+                return
+
 
 class EditorField(Horizontal):
     """A labeled input field."""
@@ -112,6 +139,22 @@ class Editor(VerticalScroll):
     }
     """
 
+    # Field ids double as the DesktopEntry attribute they edit
+    INPUT_FIELDS = (
+        "name",
+        "exec",
+        "comment",
+        "icon",
+        "path",
+        "categories",
+        "keywords",
+        "env_vars",
+        "mime_type",
+        "startup_wm_class",
+        "url",
+    )
+    SWITCH_FIELDS = ("terminal", "hidden")
+
     def compose(self) -> ComposeResult:
         yield Static("Basic Information", classes="section-title")
         yield EditorField("Name:", "name", "Application name")
@@ -138,46 +181,36 @@ class Editor(VerticalScroll):
             yield Button("Save", id="save", variant="primary")
             yield Button("Delete", id="delete", variant="error")
 
+    def on_mount(self) -> None:
+        """Cache the field widgets so edits don't need a DOM query."""
+        self._inputs: dict[str, Input] = {
+            field_id: self.query_one(f"#{field_id}", Input) for field_id in self.INPUT_FIELDS
+        }
+        self._switches: dict[str, Switch] = {
+            field_id: self.query_one(f"#{field_id}", Switch) for field_id in self.SWITCH_FIELDS
+        }
+
     def load_entry(self, entry: DesktopEntry) -> None:
         """Load a desktop entry into the editor."""
-        self.query_one("#name", Input).value = entry.name
-        self.query_one("#exec", Input).value = entry.exec
-        self.query_one("#comment", Input).value = entry.comment
-        self.query_one("#icon", Input).value = entry.icon
-        self.query_one("#path", Input).value = entry.path
-        self.query_one("#categories", Input).value = entry.categories
-        self.query_one("#keywords", Input).value = entry.keywords
-        self.query_one("#terminal", Switch).value = entry.terminal
-        self.query_one("#hidden", Switch).value = entry.hidden
-        self.query_one("#env_vars", Input).value = entry.env_vars
-        self.query_one("#mime_type", Input).value = entry.mime_type
-        self.query_one("#startup_wm_class", Input).value = entry.startup_wm_class
-        self.query_one("#url", Input).value = entry.url
+        for field_id, inp in self._inputs.items():
+            inp.value = getattr(entry, field_id)
+        for field_id, switch in self._switches.items():
+            switch.value = getattr(entry, field_id)
 
     def get_entry(self, existing: DesktopEntry | None = None) -> DesktopEntry:
         """Get a DesktopEntry from the current editor values."""
         return DesktopEntry(
-            name=self.query_one("#name", Input).value,
-            exec=self.query_one("#exec", Input).value,
-            comment=self.query_one("#comment", Input).value,
-            icon=self.query_one("#icon", Input).value,
-            path=self.query_one("#path", Input).value,
-            categories=self.query_one("#categories", Input).value,
-            keywords=self.query_one("#keywords", Input).value,
-            terminal=self.query_one("#terminal", Switch).value,
-            hidden=self.query_one("#hidden", Switch).value,
-            env_vars=self.query_one("#env_vars", Input).value,
-            mime_type=self.query_one("#mime_type", Input).value,
-            startup_wm_class=self.query_one("#startup_wm_class", Input).value,
-            url=self.query_one("#url", Input).value,
+            **{field_id: inp.value for field_id, inp in self._inputs.items()},
+            **{field_id: switch.value for field_id, switch in self._switches.items()},
             file_path=existing.file_path if existing else None,
+            is_user=existing.is_user if existing else False,
         )
 
     def clear(self) -> None:
         """Clear all fields."""
-        for inp in self.query(Input):
+        for inp in self._inputs.values():
             inp.value = ""
-        for switch in self.query(Switch):
+        for switch in self._switches.values():
             switch.value = False
 
 
@@ -227,6 +260,9 @@ class MenuEntryApp(App):
     }
     """
 
+    # Entries handed from the loader thread to the UI per batch
+    LOAD_CHUNK_SIZE = 50
+
     BINDINGS = [
         Binding("q", "quit", "Quit"),
         Binding("n", "new_entry", "New"),
@@ -239,7 +275,11 @@ class MenuEntryApp(App):
     def __init__(self) -> None:
         super().__init__()
         self.entries: list[DesktopEntry] = []
+        self._items: list[ListItem] = []
         self.current_entry: DesktopEntry | None = None
+        self._search_timer: Timer | None = None
+        self._last_query = ""
+        self._loading = False
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -257,24 +297,127 @@ class MenuEntryApp(App):
         self.load_entries()
 
     def load_entries(self) -> None:
-        """Load all desktop entries into the list."""
-        self.entries = load_all_entries()
+        """Load all desktop entries into the list in the background."""
         list_view = self.query_one("#entry-list", EntryList)
         list_view.clear()
-
-        for entry in self.entries:
-            is_user = entry.file_path and ".local" in entry.file_path
-            item = ListItem(
-                Label(entry.name),
-                classes="user-entry" if is_user else "system-entry",
-            )
+        list_view.loading = True
+        self._loading = True
+        self.entries = []
+        self._items = []
+        # Keep whatever is in the search box applied to the reloaded items
+        self._last_query = self.query_one("#search", Input).value.lower()
+        self._load_entries_worker()
+
+    @work(exclusive=True, thread=True)
+    def _load_entries_worker(self) -> None:
+        """Read entries off the UI thread and hand them over in chunks."""
+        worker = get_current_worker()
+        chunk: list[DesktopEntry] = []
+        for entry in iter_all_entries():
+            if worker.is_cancelled:
+                return
+            chunk.append(entry)
+            if len(chunk) >= self.LOAD_CHUNK_SIZE:
+                self.call_from_thread(self._add_entries, chunk, worker)
+                chunk = []
+        self.call_from_thread(self._add_entries, chunk, worker, True)
+
+    def _add_entries(
+        self, entries: list[DesktopEntry], worker: Worker, done: bool = False
+    ) -> None:
+        """Append a chunk of loaded entries to the list."""
+        # A refresh may have started a new load since this chunk was sent
+        if worker.is_cancelled:
+            return
+        list_view = self.query_one("#entry-list", EntryList)
+        items = [self._make_item(entry) for entry in entries]
+        for item, entry in zip(items, entries):
+            item.display = self._matches(entry)
+        self.entries.extend(entries)
+        self._items.extend(items)
+        # Mount the whole chunk in one batch so layout only runs once
+        list_view.extend(items)
+        # Drop the overlay once there is something to show, so later chunks
+        # are seen arriving
+        if items or done:
+            list_view.loading = False
+        if done:
+            self._loading = False
+
+    def _make_item(self, entry: DesktopEntry) -> ListItem:
+        """Create the sidebar item for an entry."""
+        item = ListItem(
+            Label(entry.name),
+            classes="user-entry" if entry.is_user else "system-entry",
+        )
+        item.entry = entry  # type: ignore
+        return item
+
+    @staticmethod
+    def _sort_key(entry: DesktopEntry) -> str:
+        """Sidebar ordering key, matching the order of get_all_desktop_files()."""
+        return Path(entry.file_path).name.lower()  # type: ignore[arg-type]
+
+    def _entry_index(self, file_path: str) -> int | None:
+        """Find the sidebar position of the entry saved at file_path."""
+        # Entries stay sorted, so bisect to the run sharing this file name
+        key = Path(file_path).name.lower()
+        index = bisect.bisect_left(self.entries, key, key=self._sort_key)
+        while index < len(self.entries) and self._sort_key(self.entries[index]) == key:
+            if self.entries[index].file_path == file_path:
+                return index
+            index += 1
+        return None
+
+    def _update_item(self, entry: DesktopEntry) -> None:
+        """Update or insert the sidebar item for a just-saved entry."""
+        if self._loading:
+            # The list is still filling in, so patching it could duplicate
+            # or misplace the entry; reload so the scan picks up the change
+            self.load_entries()
+            return
+        list_view = self.query_one("#entry-list", EntryList)
+        index = self._entry_index(entry.file_path)  # type: ignore[arg-type]
+        if index is not None:
+            item = self._items[index]
             item.entry = entry  # type: ignore
-            list_view.append(item)
+            item.query_one(Label).update(entry.name)
+            self.entries[index] = entry
+        else:
+            # User entries sort ahead of system entries with the same file name
+            index = bisect.bisect_left(self.entries, self._sort_key(entry), key=self._sort_key)
+            item = self._make_item(entry)
+            before = self._items[index] if index < len(self._items) else None
+            self.entries.insert(index, entry)
+            self._items.insert(index, item)
+            list_view.mount(item, before=before)
+        item.display = self._matches(entry)
+
+    def _remove_item(self, file_path: str) -> None:
+        """Remove the sidebar item for a deleted entry."""
+        if self._loading:
+            self.load_entries()
+            return
+        index = self._entry_index(file_path)
+        if index is not None:
+            del self.entries[index]
+            self._items.pop(index).remove()
 
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Handle entry selection."""
         if hasattr(event.item, "entry"):
-            self.current_entry = event.item.entry  # type: ignore
+            # The sidebar only holds names, so parse the full entry on demand
+            stub = event.item.entry  # type: ignore
+            entry = load_entry(Path(stub.file_path), stub.is_user)
+            if entry is None:
+                self.notify(f"Error loading {stub.file_path}", severity="error")
+                return
+            event.item.entry = entry  # type: ignore
+            if entry.name != stub.name:
+                # The file changed since the sidebar read its name
+                event.item.query_one(Label).update(entry.name)
+            self.entries[self._items.index(event.item)] = entry
+            self.current_entry = entry
             self.query_one("#editor", Editor).load_entry(self.current_entry)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
@@ -307,7 +450,7 @@ class MenuEntryApp(App):
             path = entry.save()
             self.current_entry = entry
             self.notify(f"Saved to {path}")
-            self.load_entries()
+            self._update_item(entry)
         except PermissionError:
             self.notify("Permission denied - can only edit user entries", severity="error")
         except Exception as e:
@@ -324,16 +467,17 @@ class MenuEntryApp(App):
             self.notify("File not found", severity="error")
             return
 
-        if ".local" not in str(path):
+        if not self.current_entry.is_user:
             self.notify("Cannot delete system entries", severity="error")
             return
 
         try:
             path.unlink()
+            invalidate_cached_entry(path)
             self.notify(f"Deleted {path.name}")
             self.current_entry = None
             self.query_one("#editor", Editor).clear()
-            self.load_entries()
+            self._remove_item(str(path))
         except Exception as e:
             self.notify(f"Error deleting: {e}", severity="error")
 
@@ -349,24 +493,38 @@ class MenuEntryApp(App):
     def on_input_changed(self, event: Input.Changed) -> None:
         """Handle search input changes."""
         if event.input.id == "search":
-            self.filter_entries(event.value)
+            # Debounce so a burst of keystrokes only triggers one filter pass
+            if self._search_timer:
+                self._search_timer.stop()
+            query = event.value
+            self._search_timer = self.set_timer(0.12, lambda: self.filter_entries(query))
+
+    def _matches(self, entry: DesktopEntry) -> bool:
+        """Check whether an entry matches the current search query."""
+        return not self._last_query or self._last_query in entry._name_lower
 
     def filter_entries(self, query: str) -> None:
         """Filter the entry list based on search query."""
         query = query.lower()
-        list_view = self.query_one("#entry-list", EntryList)
-        list_view.clear()
+        if query == self._last_query:
+            return
+        self._last_query = query
+
+        # Items are mounted once in load_entries; filtering only toggles visibility
+        if not query:
+            for item in self._items:
+                item.display = True
+            return
 
-        for entry in self.entries:
-            if query and query not in entry.name.lower():
-                continue
-            is_user = entry.file_path and ".local" in entry.file_path
-            item = ListItem(
-                Label(entry.name),
-                classes="user-entry" if is_user else "system-entry",
+        for item, entry in zip(self._items, self.entries):
+            item.display = query in entry._name_lower
+
+        list_view = self.query_one("#entry-list", EntryList)
+        highlighted = list_view.highlighted_child
+        if highlighted is not None and not highlighted.display:
+            list_view.index = next(
+                (i for i, item in enumerate(self._items) if item.display), None
             )
-            item.entry = entry  # type: ignore
-            list_view.append(item)
 
 
 def main() -> None:
@@ -1,11 +1,26 @@
 """Desktop file parsing and management."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 import os
+import re
 
+# Section headers and key/value lines, matched across the whole file at once.
+# [^\S\n] is horizontal whitespace (including a trailing \r).
+_SECTION_RE = re.compile(r"^[^\S\n]*\[([^\n]*)\][^\S\n]*$", re.M)
+_KV_RE = re.compile(r"^[^\S\n]*([^\s=#\[][^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.M)
 
-@dataclass
+# "env VAR=value ..." prefix written by to_string() when env vars are set. The
+# assignments are only stripped when a command follows them; otherwise just
+# "env" goes, leaving the assignments in place.
+_ENV_PREFIX_RE = re.compile(r"^env \s*(?:(?:[^\s=]*=\S*\s+)*(?=[^\s=]+(?:\s|$)))?")
+
+
+@dataclass(slots=True)
 class DesktopEntry:
     """Represents a desktop entry file."""
 
@@ -25,45 +40,68 @@ class DesktopEntry:
     startup_wm_class: str = ""
 
     file_path: str | None = None
+    is_user: bool = False
+
+    # Lowercased name used for searching, computed once at construction
+    _name_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._name_lower = self.name.lower()
 
     @classmethod
     def from_file(cls, path: Path) -> "DesktopEntry":
         """Parse a desktop file and return a DesktopEntry."""
-        content = path.read_text()
+        content = path.read_text(encoding="utf-8")
         return cls.from_string(content, str(path))
 
+    @staticmethod
+    def name_from_file(path: Path) -> str:
+        """Read just the Name key of a desktop file.
+
+        Stops at the end of the [Desktop Entry] group. Like from_string(),
+        the last Name= in the group wins.
+        """
+        name = "Unnamed"
+        in_desktop_entry = False
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("[") and line.endswith("]"):
+                    if in_desktop_entry:
+                        break  # [Desktop Entry] is over
+                    in_desktop_entry = line == "[Desktop Entry]"
+                    continue
+
+                if in_desktop_entry and not line.startswith("#"):
+                    key, sep, value = line.partition("=")
+                    if sep and key.strip() == "Name":
+                        name = value.strip()
+        return name
+
     @classmethod
     def from_string(cls, content: str, file_path: str | None = None) -> "DesktopEntry":
         """Parse desktop file content and return a DesktopEntry."""
         data: dict[str, str] = {}
-        in_desktop_entry = False
-
-        for line in content.splitlines():
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
+        start = None
+        end = len(content)
 
-            if line.startswith("[") and line.endswith("]"):
-                in_desktop_entry = line == "[Desktop Entry]"
-                continue
+        # Groups can't repeat, so stop at the header that follows [Desktop Entry]
+        for match in _SECTION_RE.finditer(content):
+            if start is not None:
+                end = match.start()
+                break
+            if match.group(1) == "Desktop Entry":
+                start = match.end()
 
-            if in_desktop_entry and "=" in line:
-                key, _, value = line.partition("=")
-                data[key.strip()] = value.strip()
+        if start is not None:
+            data.update(_KV_RE.findall(content, start, end))
 
         env_vars = data.get("X-Env-Vars", "")
         exec_cmd = data.get("Exec", "")
 
         # Strip env prefix from Exec if X-Env-Vars is set
-        if env_vars and exec_cmd.startswith("env "):
-            after_env = exec_cmd[4:]
-            parts = after_env.split()
-            cmd_start_idx = 0
-            for i, part in enumerate(parts):
-                if "=" not in part:
-                    cmd_start_idx = i
-                    break
-            exec_cmd = " ".join(parts[cmd_start_idx:])
+        if env_vars:
+            exec_cmd = _ENV_PREFIX_RE.sub("", exec_cmd, count=1)
 
         return cls(
             name=data.get("Name", "Unnamed"),
@@ -85,47 +123,33 @@ class DesktopEntry:
 
     def to_string(self) -> str:
         """Convert to desktop file format."""
-        lines = ["[Desktop Entry]"]
-        lines.append(f"Type={self.entry_type}")
-        lines.append(f"Name={self.name}")
-
-        if self.comment:
-            lines.append(f"Comment={self.comment}")
-        if self.icon:
-            lines.append(f"Icon={self.icon}")
-
+        exec_line = ""
         if self.exec:
-            if self.env_vars:
-                env_parts = [p.strip() for p in self.env_vars.split(";") if p.strip()]
-                if env_parts:
-                    lines.append(f"Exec=env {' '.join(env_parts)} {self.exec}")
-                else:
-                    lines.append(f"Exec={self.exec}")
+            env_parts = [p.strip() for p in self.env_vars.split(";") if p.strip()]
+            if env_parts:
+                exec_line = f"Exec=env {' '.join(env_parts)} {self.exec}"
             else:
-                lines.append(f"Exec={self.exec}")
-
-        if self.path:
-            lines.append(f"Path={self.path}")
-
-        lines.append(f"Terminal={'true' if self.terminal else 'false'}")
-
-        if self.categories:
-            lines.append(f"Categories={self.categories}")
-        if self.keywords:
-            lines.append(f"Keywords={self.keywords}")
-        if self.url:
-            lines.append(f"URL={self.url}")
-        if self.mime_type:
-            lines.append(f"MimeType={self.mime_type}")
-        if self.startup_wm_class:
-            lines.append(f"StartupWMClass={self.startup_wm_class}")
-
-        lines.append(f"Hidden={'true' if self.hidden else 'false'}")
-
-        if self.env_vars:
-            lines.append(f"X-Env-Vars={self.env_vars}")
-
-        return "\n".join(lines) + "\n"
+                exec_line = f"Exec={self.exec}"
+
+        # Optional keys render as "" when unset and are filtered out of the join
+        lines = (
+            "[Desktop Entry]",
+            f"Type={self.entry_type}",
+            f"Name={self.name}",
+            self.comment and f"Comment={self.comment}",
+            self.icon and f"Icon={self.icon}",
+            exec_line,
+            self.path and f"Path={self.path}",
+            f"Terminal={'true' if self.terminal else 'false'}",
+            self.categories and f"Categories={self.categories}",
+            self.keywords and f"Keywords={self.keywords}",
+            self.url and f"URL={self.url}",
+            self.mime_type and f"MimeType={self.mime_type}",
+            self.startup_wm_class and f"StartupWMClass={self.startup_wm_class}",
+            f"Hidden={'true' if self.hidden else 'false'}",
+            self.env_vars and f"X-Env-Vars={self.env_vars}",
+        )
+        return "\n".join(filter(None, lines)) + "\n"
 
     def save(self, path: Path | None = None) -> Path:
         """Save the desktop entry to a file."""
@@ -136,48 +160,117 @@ class DesktopEntry:
                 # Generate filename from name
                 filename = self.name.lower().replace(" ", "-") + ".desktop"
                 path = get_user_applications_dir() / filename
+                self.is_user = True
 
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.to_string())
+        path.write_bytes(self.to_string().encode("utf-8"))
+        invalidate_cached_entry(path)
         self.file_path = str(path)
         return path
 
 
+_LOAD_WORKERS = 8
+
+# Parsed entries keyed by file path, along with the mtime they were parsed at
+_parse_cache: dict[str, tuple[int, DesktopEntry]] = {}
+# Names read for the sidebar, keyed the same way
+_name_cache: dict[str, tuple[int, str]] = {}
+
+
+def invalidate_cached_entry(path: Path) -> None:
+    """Drop the cached parse of a desktop file."""
+    _parse_cache.pop(str(path), None)
+    _name_cache.pop(str(path), None)
+
+
+@lru_cache(maxsize=1)
 def get_user_applications_dir() -> Path:
     """Get the user's applications directory."""
     return Path.home() / ".local" / "share" / "applications"
 
 
+@lru_cache(maxsize=1)
 def get_system_applications_dir() -> Path:
     """Get the system applications directory."""
     return Path("/usr/share/applications")
 
 
-def get_all_desktop_files() -> list[tuple[Path, bool]]:
-    """Get all desktop files. Returns (path, is_user_file) tuples."""
-    files: list[tuple[Path, bool]] = []
+def _scan_desktop_files(directory: Path, is_user: bool) -> list[tuple[str, Path, bool]]:
+    """List the desktop files in a directory as (lowercased name, path, is_user_file)."""
+    try:
+        with os.scandir(directory) as it:
+            return [
+                (e.name.lower(), Path(e.path), is_user)
+                for e in it
+                if e.name.endswith(".desktop") and e.is_file()
+            ]
+    except OSError:
+        return []
 
-    # User files
-    user_dir = get_user_applications_dir()
-    if user_dir.exists():
-        for f in user_dir.glob("*.desktop"):
-            files.append((f, True))
 
-    # System files
-    system_dir = get_system_applications_dir()
-    if system_dir.exists():
-        for f in system_dir.glob("*.desktop"):
-            files.append((f, False))
-
-    return sorted(files, key=lambda x: x[0].name.lower())
+def get_all_desktop_files() -> list[tuple[Path, bool]]:
+    """Get all desktop files. Returns (path, is_user_file) tuples."""
+    files = _scan_desktop_files(get_user_applications_dir(), True)
+    files += _scan_desktop_files(get_system_applications_dir(), False)
+    files.sort(key=itemgetter(0))
+    return [(path, is_user) for _, path, is_user in files]
+
+
+def load_entry(path: Path, is_user: bool = False) -> DesktopEntry | None:
+    """Fully load a desktop entry, reusing the cached parse if unchanged."""
+    key = str(path)
+    try:
+        mtime = path.stat().st_mtime_ns
+        cached = _parse_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            # Hand out a copy so edits never leak into the cache
+            return replace(cached[1], is_user=is_user)
+        entry = DesktopEntry.from_file(path)
+    except Exception:
+        return None  # Skip invalid files
+    _parse_cache[key] = (mtime, entry)
+    return replace(entry, is_user=is_user)
+
+
+def _load_stub(path: Path, is_user: bool) -> DesktopEntry | None:
+    """Load a desktop entry with only its name and file path filled in."""
+    key = str(path)
+    try:
+        mtime = path.stat().st_mtime_ns
+        cached = _parse_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return DesktopEntry(name=cached[1].name, file_path=key, is_user=is_user)
+        cached_name = _name_cache.get(key)
+        if cached_name is not None and cached_name[0] == mtime:
+            name = cached_name[1]
+        else:
+            name = DesktopEntry.name_from_file(path)
+    except Exception:
+        return None  # Skip invalid files
+    _name_cache[key] = (mtime, name)
+    return DesktopEntry(name=name, file_path=key, is_user=is_user)
+
+
+def iter_all_entries() -> Iterator[DesktopEntry]:
+    """Yield all desktop entries in sorted order as they finish loading.
+
+    Only the name of each entry is read; use load_entry() on an entry's
+    file path to get the rest of its fields.
+    """
+    files = get_all_desktop_files()
+    paths = [path for path, _ in files]
+    user_flags = [is_user for _, is_user in files]
+    # Loading is dominated by file reads, so overlap them across threads
+    with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+        for entry in executor.map(_load_stub, paths, user_flags):
+            if entry is not None:
+                yield entry
 
 
 def load_all_entries() -> list[DesktopEntry]:
-    """Load all desktop entries."""
-    entries = []
-    for path, _ in get_all_desktop_files():
-        try:
-            entries.append(DesktopEntry.from_file(path))
-        except Exception:
-            pass  # Skip invalid files
-    return entries
+    """Load all desktop entries with every field parsed."""
+    files = get_all_desktop_files()
+    paths = [path for path, _ in files]
+    user_flags = [is_user for _, is_user in files]
+    with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+        return [e for e in executor.map(load_entry, paths, user_flags) if e is not None]